@@ -127,3 +127,23 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Limites des CSV uploadés pour la prédiction (taille reçue et taille une fois décompressée)
+PREDICTION_MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+PREDICTION_MAX_DECOMPRESSED_SIZE = 200 * 1024 * 1024
+# Uploads reçus en mémoire uniquement (pas de fichier temporaire), coupés au-delà de la taille maximale
+FILE_UPLOAD_HANDLERS = ['prediction_app.upload_handlers.BoundedMemoryFileUploadHandler']
+
+# Journal d'audit des prédictions : écriture groupée dès N lignes en attente ou après N secondes
+PREDICTION_AUDIT_BATCH_SIZE = 500
+PREDICTION_AUDIT_FLUSH_INTERVAL = 5.0
+# Lignes gardées en attente au plus si la base est indisponible
+PREDICTION_AUDIT_MAX_PENDING = 50_000
+# Tentatives d'écriture d'une exécution avant de l'abandonner (une exécution fautive ne bloque pas les autres)
+PREDICTION_AUDIT_MAX_ATTEMPTS = 5
+
+# Suivi de la dérive : demi-vie (en lignes) des agrégats en production
+PREDICTION_MONITORING_HALF_LIFE = 1000
+
+# Préchargement des modèles et données au démarrage du serveur WSGI/ASGI (désactivé par défaut : chargement au premier besoin)
+PREDICTION_WARM_UP = os.environ.get('PREDICTION_WARM_UP', '') == '1'
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'casa_tramway_project.settings')
 
 application = get_wsgi_application()
+
+# Préchargement optionnel des ressources de prédiction (PREDICTION_WARM_UP), serveur uniquement
+from prediction_app.services.resources import warm_up_if_enabled  # noqa: E402
+warm_up_if_enabled()
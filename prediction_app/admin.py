@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import PredictionRun, PredictionRecord
+
+
+@admin.register(PredictionRun)
+class PredictionRunAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'model_name', 'model_version', 'n_rows', 'input_hash')
+    list_filter = ('model_name',)
+    date_hierarchy = 'created_at'
+
+
+@admin.register(PredictionRecord)
+class PredictionRecordAdmin(admin.ModelAdmin):
+    list_display = ('date', 'model_name', 'predicted', 'actual', 'run')
+    list_filter = ('model_name',)
+    date_hierarchy = 'date'
+    list_select_related = ('run',)
@@ -0,0 +1,46 @@
+# prediction_app/management/commands/startup_report.py
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Exécuté dans un interpréteur neuf (sans wsgi.py, donc sans préchargement) pour mesurer
+# un démarrage à froid puis le coût de chaque ressource chargée à la demande
+STARTUP_TIMING_SCRIPT = """
+import json, os, sys, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', {settings_module!r})
+start = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+import prediction_app.views
+views = time.perf_counter()
+heavy = [name for name in ('pandas', 'joblib', 'xgboost', 'sklearn') if name in sys.modules]
+from prediction_app.services.resources import warm_up
+timings = warm_up()
+print(json.dumps({{'setup': setup - start, 'views': views - setup, 'heavy': heavy, 'warm_up': timings}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Mesure le temps d'import de l'application et de préchargement des ressources."
+
+    def handle(self, *args, **options):
+        script = STARTUP_TIMING_SCRIPT.format(settings_module=os.environ.get('DJANGO_SETTINGS_MODULE'))
+        try:
+            result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                                    cwd=settings.BASE_DIR, check=True)
+        except subprocess.CalledProcessError as e:
+            raise CommandError(f"La mesure du démarrage a échoué (code {e.returncode}) :\n{e.stderr.strip()}")
+
+        # Les chargeurs affichent leurs propres messages : le rapport est la dernière ligne
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        self.stdout.write(f"{'django.setup()':<30}: {report['setup']:.3f}s")
+        self.stdout.write(f"{'import prediction_app.views':<30}: {report['views']:.3f}s")
+        self.stdout.write(f"{'Modules lourds déjà importés':<30}: {', '.join(report['heavy']) or 'aucun'}")
+        for name, seconds in report['warm_up'].items():
+            self.stdout.write(f"{name:<30}: {seconds:.3f}s")
+        self.stdout.write(f"{'Préchargement total':<30}: {sum(report['warm_up'].values()):.3f}s")
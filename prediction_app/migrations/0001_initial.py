@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:29
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('model_name', models.CharField(max_length=100)),
+                ('model_version', models.CharField(blank=True, max_length=64)),
+                ('input_hash', models.CharField(max_length=64)),
+                ('n_rows', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['model_name', 'created_at'], name='prediction__model_n_a0fbb1_idx'), models.Index(fields=['input_hash'], name='prediction__input_h_806fe0_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PredictionRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=100)),
+                ('date', models.DateField()),
+                ('predicted', models.FloatField()),
+                ('actual', models.FloatField(blank=True, null=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='records', to='prediction_app.predictionrun')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['date'], name='prediction__date_6f1b6d_idx'), models.Index(fields=['model_name', 'date'], name='prediction__model_n_1d98b4_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,44 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+
+class PredictionRun(models.Model):
+    """Une exécution de prédiction : modèle utilisé, sa version et l'empreinte des données d'entrée."""
+    # Identifiant généré côté Python pour pouvoir insérer les lignes liées dans le même lot
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    model_name = models.CharField(max_length=100)
+    model_version = models.CharField(max_length=64, blank=True)
+    input_hash = models.CharField(max_length=64)
+    n_rows = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['model_name', 'created_at']),
+            models.Index(fields=['input_hash']),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} ({self.created_at:%Y-%m-%d %H:%M})"
+
+
+class PredictionRecord(models.Model):
+    """Une ligne prédite : date cible, valeur prédite et fréquentation réelle si connue."""
+    run = models.ForeignKey(PredictionRun, on_delete=models.CASCADE, related_name='records')
+    # Dénormalisé depuis le run pour filtrer par modèle et période sans jointure
+    model_name = models.CharField(max_length=100)
+    date = models.DateField()
+    predicted = models.FloatField()
+    actual = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['date']
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['model_name', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} {self.date} : {self.predicted:.0f}"
@@ -0,0 +1,250 @@
+# prediction_app/services/audit_log.py
+import atexit
+import hashlib
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import PredictionRun, PredictionRecord
+
+logger = logging.getLogger(__name__)
+
+# Déclencheurs d'écriture : nombre de lignes en attente ou délai écoulé (secondes)
+AUDIT_BATCH_SIZE = getattr(settings, 'PREDICTION_AUDIT_BATCH_SIZE', 500)
+AUDIT_FLUSH_INTERVAL = getattr(settings, 'PREDICTION_AUDIT_FLUSH_INTERVAL', 5.0)
+# Lignes conservées au plus en mémoire si la base est indisponible (les plus anciennes sont abandonnées)
+AUDIT_MAX_PENDING = getattr(settings, 'PREDICTION_AUDIT_MAX_PENDING', 50_000)
+# Tentatives d'écriture d'une même exécution avant de l'abandonner
+AUDIT_MAX_ATTEMPTS = getattr(settings, 'PREDICTION_AUDIT_MAX_ATTEMPTS', 5)
+
+
+def hash_dataframe(df):
+    """Empreinte SHA-256 stable du contenu d'un DataFrame (valeurs et noms de colonnes)."""
+    digest = hashlib.sha256(','.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def hash_file(file_path, block_size=1024 * 1024):
+    """Empreinte courte d'un fichier, utilisée comme version d'un modèle sérialisé."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+class _PendingRun:
+    """Exécution en attente d'écriture : métadonnées et colonnes brutes, sans objet ORM."""
+
+    __slots__ = ('model_name', 'model_version', 'input_hash', 'created_at',
+                 'dates', 'predicted', 'actual', 'attempts')
+
+    def __init__(self, model_name, model_version, input_hash, created_at, dates, predicted, actual):
+        self.model_name = model_name
+        self.model_version = model_version
+        self.input_hash = input_hash
+        self.created_at = created_at
+        self.dates = dates
+        self.predicted = predicted
+        self.actual = actual
+        self.attempts = 0
+
+    @property
+    def n_rows(self):
+        return len(self.predicted)
+
+    def to_instances(self):
+        """Construit l'exécution et ses lignes (appelé dans le thread d'écriture)."""
+        run = PredictionRun(model_name=self.model_name, model_version=self.model_version,
+                            input_hash=self.input_hash, n_rows=self.n_rows, created_at=self.created_at)
+        actual = np.where(np.isnan(self.actual), None, self.actual).tolist()
+        records = [
+            PredictionRecord(run=run, model_name=self.model_name, date=date, predicted=predicted, actual=value)
+            for date, predicted, value in zip(self.dates.tolist(), self.predicted.tolist(), actual)
+        ]
+        return run, records
+
+
+class AuditLogWriter:
+    """
+    Journal d'audit des prédictions, écrit par lots en arrière-plan.
+    submit() ne fait que copier les colonnes utiles en mémoire tampon : la construction des
+    objets et les insertions (bulk_create) ont lieu dans un thread dédié dès que batch_size
+    lignes sont en attente ou que flush_interval secondes se sont écoulées. Le thread n'est
+    démarré qu'au premier submit(), donc jamais dans le processus maître avant un fork.
+    Si l'écriture groupée échoue, chaque exécution est retentée dans sa propre transaction :
+    celles qui échouent encore sont remises en tête du tampon, et abandonnées après
+    max_attempts tentatives pour ne pas bloquer les suivantes. Un dépassement de max_pending
+    lignes en attente fait aussi abandonner les plus anciennes.
+    """
+
+    def __init__(self, batch_size=AUDIT_BATCH_SIZE, flush_interval=AUDIT_FLUSH_INTERVAL,
+                 max_pending=AUDIT_MAX_PENDING, max_attempts=AUDIT_MAX_ATTEMPTS, autostart=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.autostart = autostart
+        self._runs = []
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+        self._atexit_registered = False
+        # Coût mesuré sur le chemin de la requête (submit) et côté écriture (flush)
+        self.stats = {'submits': 0, 'submit_seconds': 0.0, 'flushes': 0, 'flush_seconds': 0.0,
+                      'rows_written': 0, 'errors': 0, 'rows_requeued': 0, 'rows_dropped': 0,
+                      'runs_abandoned': 0}
+
+    def __len__(self):
+        with self._lock:
+            return self._pending_rows
+
+    def submit(self, model_name, model_version, df_input, df_predictions):
+        """
+        Met en file une exécution et ses lignes ('Date', 'Predictions', 'Passagers_Reels').
+        df_input (données uploadées) sert à calculer l'empreinte des entrées.
+        Retourne la durée passée sur le chemin de la requête (empreinte comprise), en secondes.
+        """
+        start = time.perf_counter()
+        # Copies des colonnes seulement : aucun objet par ligne sur le chemin de la requête
+        run = _PendingRun(
+            model_name, model_version or '', hash_dataframe(df_input), timezone.now(),
+            pd.to_datetime(df_predictions['Date']).to_numpy(dtype='datetime64[D]'),
+            df_predictions['Predictions'].to_numpy(dtype='float64', copy=True),
+            df_predictions['Passagers_Reels'].to_numpy(dtype='float64', copy=True),
+        )
+
+        with self._lock:
+            self._runs.append(run)
+            self._pending_rows += run.n_rows
+            self._drop_overflow()
+            pending = self._pending_rows
+        if self.autostart:
+            self._ensure_thread()
+            if pending >= self.batch_size:
+                self._wakeup.set()
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stats['submits'] += 1
+            self.stats['submit_seconds'] += elapsed
+        return elapsed
+
+    def _write(self, pending):
+        """Insère des exécutions en attente et leurs lignes dans une seule transaction."""
+        runs, records = [], []
+        for entry in pending:
+            run, run_records = entry.to_instances()
+            runs.append(run)
+            records.extend(run_records)
+        with transaction.atomic():
+            PredictionRun.objects.bulk_create(runs, batch_size=self.batch_size)
+            PredictionRecord.objects.bulk_create(records, batch_size=self.batch_size)
+        return len(records)
+
+    def flush(self):
+        """
+        Écrit immédiatement tout le tampon en deux bulk_create dans une transaction.
+        En cas d'échec, chaque exécution est retentée seule pour isoler celles qui échouent.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending = self._runs
+                self._runs, self._pending_rows = [], 0
+            if not pending:
+                return 0
+
+            start = time.perf_counter()
+            failed = []
+            try:
+                written = self._write(pending)
+            except Exception as e:
+                logger.warning("Échec de l'écriture groupée du journal d'audit, écriture par exécution : %s", e)
+                written = 0
+                for entry in pending:
+                    try:
+                        written += self._write([entry])
+                    except Exception as e:
+                        entry.attempts += 1
+                        failed.append((entry, e))
+
+            requeued, abandoned = [], []
+            for entry, error in failed:
+                (requeued if entry.attempts < self.max_attempts else abandoned).append(entry)
+                logger.error("Échec de l'écriture du journal d'audit (%s, %d lignes, tentative %d/%d) : %s",
+                             entry.model_name, entry.n_rows, entry.attempts, self.max_attempts, error)
+            for entry in abandoned:
+                logger.error("Exécution abandonnée par le journal d'audit après %d tentatives (%s, %d lignes)",
+                             entry.attempts, entry.model_name, entry.n_rows)
+
+            with self._lock:
+                # Remises en tête du tampon pour conserver l'ordre d'arrivée
+                self._runs = requeued + self._runs
+                self._pending_rows += sum(entry.n_rows for entry in requeued)
+                self.stats['errors'] += len(failed)
+                self.stats['rows_requeued'] += sum(entry.n_rows for entry in requeued)
+                self.stats['runs_abandoned'] += len(abandoned)
+                self._drop_overflow()
+                if written:
+                    self.stats['flushes'] += 1
+                    self.stats['flush_seconds'] += time.perf_counter() - start
+                    self.stats['rows_written'] += written
+            return written
+
+    def _drop_overflow(self):
+        """Abandonne les exécutions les plus anciennes au-delà de max_pending lignes (appelé sous verrou)."""
+        dropped = 0
+        while self._runs and self._pending_rows > self.max_pending:
+            run = self._runs.pop(0)
+            self._pending_rows -= run.n_rows
+            dropped += run.n_rows
+        if dropped:
+            self.stats['rows_dropped'] += dropped
+            logger.error("Journal d'audit saturé : %d lignes les plus anciennes abandonnées", dropped)
+
+    def snapshot(self):
+        """Compteurs et coût moyen par requête, sérialisables en JSON."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['pending_rows'] = self._pending_rows
+        stats['submit_ms_mean'] = 1000 * stats['submit_seconds'] / stats['submits'] if stats['submits'] else None
+        return stats
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='prediction-audit-writer', daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            # Connexion propre à ce thread : on la libère entre deux lots
+            connection.close()
+
+    def close(self):
+        """Arrête le thread d'écriture et vide le tampon restant."""
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval)
+        self.flush()
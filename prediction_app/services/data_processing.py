@@ -2,6 +2,7 @@
 import pandas as pd
 import numpy as np
 import os
+from .lag_features import create_lag_features
 
 def load_events_holidays_data(file_path):
     """Charge les données d'événements et jours fériés depuis un CSV."""
@@ -80,10 +81,13 @@ def create_weather_features(df):
     
     return df
 
-def preprocess_data(df_raw, df_events_holidays=None):
+def preprocess_data(df_raw, df_events_holidays=None, lag_store=None, lag_features=True):
     """
     Fonction principale de prétraitement des données.
     Prend un DataFrame brut (issu de l'upload) et un DataFrame d'événements/vacances.
+    Si un LagFeatureStore est fourni, les features de décalage s'appuient sur sa mémoire
+    (calcul limité aux nouvelles lignes) sans la modifier.
+    lag_features=False saute ces features (ex. affichage de l'historique).
     Retourne un DataFrame prêt pour la prédiction.
     """
     df = df_raw.copy()
@@ -103,6 +107,10 @@ def preprocess_data(df_raw, df_events_holidays=None):
         df['Passagers_Reels'] = np.nan # Ajoute une colonne vide pour la cohérence
 
     df = create_time_features(df)
+
+    # Features de fréquentation récente : décalages t-1, t-7, t-364 et fenêtres glissantes
+    if lag_features:
+        df = lag_store.transform(df) if lag_store is not None else create_lag_features(df)
     
     if df_events_holidays is not None and not df_events_holidays.empty:
         df = merge_events_holidays(df, df_events_holidays)
@@ -0,0 +1,171 @@
+# prediction_app/services/lag_features.py
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Décalages (en jours) et fenêtres glissantes (en jours) calculés sur la fréquentation
+LAG_DAYS = (1, 7, 364)
+ROLLING_WINDOWS = (7, 28)
+
+# Historique minimal à conserver pour pouvoir calculer toutes les features d'une nouvelle date
+HISTORY_HORIZON_DAYS = max(max(LAG_DAYS), max(ROLLING_WINDOWS))
+# Avance maximale (en jours) qu'une mise à jour peut faire prendre à une série déjà connue
+MAX_ADVANCE_DAYS = 7
+
+
+def lag_feature_columns(prefix='Passagers'):
+    """Retourne la liste ordonnée des colonnes créées par create_lag_features."""
+    columns = [f'{prefix}_Lag_{lag}' for lag in LAG_DAYS]
+    for window in ROLLING_WINDOWS:
+        columns.append(f'{prefix}_Moyenne_Mobile_{window}')
+        columns.append(f'{prefix}_Ecart_Type_Mobile_{window}')
+    return columns
+
+
+def create_lag_features(df, target_col='Passagers_Reels', group_cols=None, prefix='Passagers'):
+    """
+    Ajoute les features de décalage (t-1, t-7, t-364) et les moyennes/écarts-types glissants.
+    Les calculs sont vectorisés et groupés par série (group_cols, ex. une station ou une ligne).
+    Les décalages sont calendaires : une date manquante donne NaN au lieu de décaler les lignes.
+    Les fenêtres glissantes excluent le jour courant pour éviter toute fuite de la cible.
+    """
+    group_cols = list(group_cols or [])
+    for col in group_cols + ['Date', target_col]:
+        if col not in df.columns:
+            raise ValueError(f"Le DataFrame doit contenir une colonne '{col}'.")
+
+    df['Date'] = pd.to_datetime(df['Date'])
+    keys = group_cols + ['Date']
+    series = df[keys + [target_col]]
+
+    # Décalages : jointure sur (série, date + k jours) plutôt qu'un shift de lignes
+    observed = series.dropna(subset=[target_col]).drop_duplicates(subset=keys, keep='last')
+    for lag in LAG_DAYS:
+        shifted = observed.assign(Date=observed['Date'] + pd.Timedelta(days=lag))
+        merged = series[keys].merge(shifted, on=keys, how='left')
+        df[f'{prefix}_Lag_{lag}'] = merged[target_col].to_numpy()
+
+    # Fenêtres glissantes temporelles, fermées à gauche : [t - fenêtre, t)
+    ordered = series.sort_values(keys, kind='stable')
+    for window in ROLLING_WINDOWS:
+        if group_cols:
+            rolling = ordered.groupby(group_cols, sort=True).rolling(
+                f'{window}D', on='Date', closed='left', min_periods=1)[target_col]
+        else:
+            rolling = ordered.rolling(f'{window}D', on='Date', closed='left', min_periods=1)[target_col]
+        # Les résultats suivent l'ordre trié : on les réaligne sur l'index d'origine
+        means = pd.Series(rolling.mean().to_numpy(), index=ordered.index)
+        stds = pd.Series(rolling.std().to_numpy(), index=ordered.index)
+        df[f'{prefix}_Moyenne_Mobile_{window}'] = means.reindex(df.index)
+        df[f'{prefix}_Ecart_Type_Mobile_{window}'] = stds.reindex(df.index)
+
+    return df
+
+
+class LagFeatureStore:
+    """
+    Mémoire incrémentale de la fin de chaque série de fréquentation.
+    Ne conserve que les HISTORY_HORIZON_DAYS derniers jours observés par série, de sorte
+    qu'une nouvelle date (ou un nouveau lot) ne recalcule les fenêtres que sur ces lignes-là
+    et jamais sur tout l'historique.
+    transform() est en lecture seule : seules des sources fiables (historique, flux de
+    fréquentation réelle) doivent alimenter la mémoire via update().
+    """
+
+    def __init__(self, target_col='Passagers_Reels', group_cols=None, prefix='Passagers'):
+        self.target_col = target_col
+        self.group_cols = list(group_cols or [])
+        self.prefix = prefix
+        self._keys = self.group_cols + ['Date']
+        self._tail = pd.DataFrame({col: pd.Series(dtype='object') for col in self.group_cols})
+        self._tail['Date'] = pd.Series(dtype='datetime64[ns]')
+        self._tail[self.target_col] = pd.Series(dtype='float64')
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tail)
+
+    @property
+    def tail(self):
+        """Copie de la fin des séries actuellement conservée."""
+        return self._tail.copy()
+
+    def _observations(self, df):
+        if self.target_col not in df.columns:
+            return pd.DataFrame(columns=self._keys + [self.target_col])
+        obs = df[self._keys + [self.target_col]].copy()
+        obs['Date'] = pd.to_datetime(obs['Date'])
+        obs[self.target_col] = obs[self.target_col].astype('float64')
+        return obs.dropna(subset=[self.target_col])
+
+    def _within_horizon(self, obs):
+        """
+        Garde les observations compatibles avec la mémoire actuelle : ni plus anciennes que
+        l'horizon conservé, ni plus de MAX_ADVANCE_DAYS après la dernière date connue de leur série.
+        Une série encore inconnue est acceptée telle quelle (amorçage).
+        """
+        if self._tail.empty:
+            return obs
+        if self.group_cols:
+            newest = self._tail.groupby(self.group_cols, as_index=False)['Date'].max()
+            bounds = obs[self.group_cols].merge(newest, on=self.group_cols, how='left')['Date'].to_numpy()
+            newest_dates = pd.Series(bounds, index=obs.index)
+        else:
+            newest_dates = pd.Series(self._tail['Date'].max(), index=obs.index)
+        known = newest_dates.notna()
+        in_range = ((obs['Date'] >= newest_dates - pd.Timedelta(days=HISTORY_HORIZON_DAYS))
+                    & (obs['Date'] <= newest_dates + pd.Timedelta(days=MAX_ADVANCE_DAYS)))
+        return obs[~known | in_range]
+
+    def update(self, df):
+        """Ajoute les valeurs observées de df à la mémoire puis tronque chaque série à l'horizon."""
+        obs = self._observations(df)
+        if obs.empty:
+            return self
+        with self._lock:
+            accepted = self._within_horizon(obs)
+            if len(accepted) < len(obs):
+                print(f"Avertissement : {len(obs) - len(accepted)} observation(s) hors horizon ignorée(s) "
+                      f"par la mémoire des features de décalage.")
+            if accepted.empty:
+                return self
+            obs = accepted
+            tail = obs if self._tail.empty else pd.concat([self._tail, obs], ignore_index=True)
+            tail = tail.drop_duplicates(subset=self._keys, keep='last')
+            if self.group_cols:
+                latest = tail.groupby(self.group_cols)['Date'].transform('max')
+            else:
+                latest = tail['Date'].max()
+            cutoff = latest - pd.Timedelta(days=HISTORY_HORIZON_DAYS)
+            self._tail = tail[tail['Date'] >= cutoff].sort_values(self._keys).reset_index(drop=True)
+        return self
+
+    def transform(self, df):
+        """
+        Calcule les features de décalage pour les lignes de df en s'appuyant sur la mémoire.
+        Seules les lignes de df (plus la fin des séries conservée) passent par les fenêtres.
+        """
+        new_rows = df[self._keys].copy()
+        new_rows['Date'] = pd.to_datetime(new_rows['Date'])
+        if self.target_col in df.columns:
+            new_rows[self.target_col] = df[self.target_col].astype('float64')
+        else:
+            new_rows[self.target_col] = np.nan
+
+        with self._lock:
+            tail = self._tail.copy()
+        # Seules les valeurs observées du lot priment sur celles en mémoire pour une même date :
+        # une ligne à prévoir (cible NaN) ne doit pas effacer une valeur réelle déjà connue
+        observed_keys = new_rows.dropna(subset=[self.target_col])[self._keys].drop_duplicates()
+        tail = tail.merge(observed_keys, on=self._keys, how='left', indicator=True)
+        tail = tail[tail['_merge'] == 'left_only'].drop(columns='_merge')
+
+        context = pd.concat([tail, new_rows.reset_index(drop=True)], ignore_index=True)
+        context = create_lag_features(context, self.target_col, self.group_cols, self.prefix)
+        features = context.iloc[len(tail):][lag_feature_columns(self.prefix)]
+        features.index = df.index
+
+        for col in features.columns:
+            df[col] = features[col]
+        return df
@@ -0,0 +1,226 @@
+# prediction_app/services/monitoring.py
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+# Features suivies : nom dans le DataFrame de prédiction -> nom dans data/processed/ (et dans le CSV uploadé).
+# Les champs calendaires (Mois, Jour) sont exclus : ils reflètent la période uploadée, pas une dérive.
+MONITORED_FEATURES = {
+    'Temperature_Moyenne_C': 'Temperature_Moyenne_C',
+    'Precipitations_mm': 'Precipitations_mm',
+    'Passagers_Reels': 'Nb_Passagers',
+}
+N_BINS = 10
+# Lissage des proportions nulles pour que le PSI reste fini
+PSI_EPSILON = 1e-4
+# Demi-vie (en lignes) de la décroissance exponentielle des agrégats en production :
+# une ligne reçue il y a HALF_LIFE lignes pèse moitié moins qu'une ligne récente.
+MONITORING_HALF_LIFE = getattr(settings, 'PREDICTION_MONITORING_HALF_LIFE', 1000)
+
+
+def _decay(n_rows, half_life):
+    """Facteur à appliquer aux agrégats existants avant d'ajouter n_rows nouvelles lignes."""
+    return 1.0 if not half_life else 0.5 ** (n_rows / half_life)
+
+
+class RunningErrorMetrics:
+    """
+    Métriques d'erreur (MAE, RMSE, MAPE, biais) en mémoire constante, pondérées par une
+    décroissance exponentielle de demi-vie half_life lignes (None : cumul sans oubli).
+    """
+
+    def __init__(self, half_life=MONITORING_HALF_LIFE):
+        self.half_life = half_life
+        self.total = 0
+        self.count = 0.0
+        self.sum_error = 0.0
+        self.sum_abs_error = 0.0
+        self.sum_sq_error = 0.0
+        self.sum_abs_pct_error = 0.0
+        self.count_pct = 0.0
+
+    def update(self, actual, predicted):
+        """Ajoute un lot ; les lignes sans valeur réelle sont ignorées."""
+        actual = np.asarray(actual, dtype='float64')
+        predicted = np.asarray(predicted, dtype='float64')
+        mask = ~np.isnan(actual) & ~np.isnan(predicted)
+        if not mask.any():
+            return self
+        error = predicted[mask] - actual[mask]
+        n_rows = int(mask.sum())
+        alpha = _decay(n_rows, self.half_life)
+        nonzero = actual[mask] != 0
+        self.total += n_rows
+        self.count = alpha * self.count + n_rows
+        self.sum_error = alpha * self.sum_error + float(error.sum())
+        self.sum_abs_error = alpha * self.sum_abs_error + float(np.abs(error).sum())
+        self.sum_sq_error = alpha * self.sum_sq_error + float((error ** 2).sum())
+        self.count_pct = alpha * self.count_pct + int(nonzero.sum())
+        self.sum_abs_pct_error = (alpha * self.sum_abs_pct_error
+                                  + float(np.abs(error[nonzero] / actual[mask][nonzero]).sum()))
+        return self
+
+    def as_dict(self):
+        if self.total == 0:
+            return {'count': 0, 'weight': 0.0, 'mae': None, 'rmse': None, 'mape': None, 'bias': None}
+        return {
+            'count': self.total,
+            'weight': self.count,
+            'mae': self.sum_abs_error / self.count,
+            'rmse': float(np.sqrt(self.sum_sq_error / self.count)),
+            'mape': 100 * self.sum_abs_pct_error / self.count_pct if self.count_pct else None,
+            'bias': self.sum_error / self.count,
+        }
+
+
+class FeatureSketch:
+    """
+    Histogramme à bornes fixes d'une feature, plus moyenne/variance (Welford).
+    Les bornes viennent des quantiles des données d'entraînement, de sorte que la mémoire
+    reste fixe (N_BINS compteurs) quel que soit le volume de prédictions reçu.
+    Avec half_life, compteurs et moments décroissent exponentiellement : le sketch décrit
+    les données récentes et une dérive tardive n'est pas diluée dans tout l'historique.
+    """
+
+    def __init__(self, edges, half_life=None):
+        self.edges = np.asarray(edges, dtype='float64')
+        self.half_life = half_life
+        self.counts = np.zeros(len(self.edges) + 1, dtype='float64')
+        self.total = 0
+        self.n = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @classmethod
+    def from_values(cls, values, n_bins=N_BINS):
+        """Construit un sketch de référence à partir de valeurs d'entraînement."""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+        sketch = cls(np.unique(np.quantile(values, quantiles)) if len(values) else [])
+        return sketch.update(values)
+
+    def update(self, values):
+        """Ajoute un lot de valeurs (les NaN sont ignorés)."""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        batch_n = len(values)
+        alpha = _decay(batch_n, self.half_life)
+        self.counts *= alpha
+        self.n *= alpha
+        self.m2 *= alpha
+        self.total += batch_n
+
+        bins = np.searchsorted(self.edges, values, side='right')
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+
+        # Fusion de la moyenne/variance du lot avec celles déjà cumulées (Chan et al.)
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.n + batch_n
+        delta = batch_mean - self.mean
+        self.mean += delta * batch_n / total
+        self.m2 += batch_m2 + delta ** 2 * self.n * batch_n / total
+        self.n = total
+        return self
+
+    def empty_like(self, half_life=None):
+        """Sketch vide partageant les mêmes bornes (pour les données en production)."""
+        return FeatureSketch(self.edges, half_life)
+
+    def proportions(self):
+        return self.counts / self.counts.sum() if self.total else np.zeros(len(self.counts))
+
+    def as_dict(self):
+        return {
+            'count': self.total,
+            'weight': self.n,
+            'mean': self.mean if self.total else None,
+            'std': float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else None,
+        }
+
+
+def population_stability_index(reference, live):
+    """PSI entre deux sketches de mêmes bornes."""
+    ref = np.clip(reference.proportions(), PSI_EPSILON, None)
+    cur = np.clip(live.proportions(), PSI_EPSILON, None)
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+def ks_statistic(reference, live):
+    """
+    Statistique de Kolmogorov-Smirnov calculée sur les bornes des sketches.
+    C'est un minorant de la statistique exacte, suffisant pour détecter une dérive.
+    """
+    return float(np.max(np.abs(np.cumsum(reference.proportions()) - np.cumsum(live.proportions()))))
+
+
+class DriftMonitor:
+    """
+    Suivi en continu de la précision par modèle et de la dérive des features.
+    Chaque lot de prédictions met à jour des agrégats de taille fixe, à décroissance
+    exponentielle (demi-vie half_life lignes) ; l'historique n'est jamais relu.
+    L'état est propre au processus (non partagé entre workers, perdu au redémarrage).
+    """
+
+    def __init__(self, reference_sketches, features=MONITORED_FEATURES, half_life=MONITORING_HALF_LIFE):
+        self.reference = reference_sketches
+        self.features = features
+        self.half_life = half_life
+        self.live = {name: sketch.empty_like(half_life) for name, sketch in reference_sketches.items()}
+        self.errors = {}
+        self.n_batches = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_training_data(cls, file_path, features=MONITORED_FEATURES):
+        """Construit les sketches de référence à partir du CSV d'entraînement (data/processed/)."""
+        if not os.path.exists(file_path):
+            print(f"Avertissement: Le fichier d'entraînement n'existe pas à {file_path}. Aucune dérive ne sera calculée.")
+            return cls({})
+        df_train = pd.read_csv(file_path, usecols=lambda col: col in features.values())
+        sketches = {
+            name: FeatureSketch.from_values(df_train[train_col])
+            for name, train_col in features.items() if train_col in df_train.columns
+        }
+        return cls(sketches, features)
+
+    def update(self, model_name, df_predictions, uploaded_columns=None):
+        """
+        Intègre un lot : erreurs si 'Passagers_Reels' est connu, distributions des features suivies.
+        uploaded_columns (colonnes du CSV d'origine) limite le suivi aux features réellement fournies,
+        et non complétées par le prétraitement (ex. météo simulée).
+        """
+        with self._lock:
+            if 'Passagers_Reels' in df_predictions.columns and 'Predictions' in df_predictions.columns:
+                metrics = self.errors.setdefault(model_name, RunningErrorMetrics(self.half_life))
+                metrics.update(df_predictions['Passagers_Reels'], df_predictions['Predictions'])
+            for name, sketch in self.live.items():
+                if uploaded_columns is not None and self.features.get(name, name) not in uploaded_columns:
+                    continue
+                if name in df_predictions.columns:
+                    sketch.update(df_predictions[name])
+            self.n_batches += 1
+
+    def snapshot(self):
+        """Etat courant des métriques, sérialisable en JSON pour le tableau de bord."""
+        with self._lock:
+            drift = {}
+            for name, live in self.live.items():
+                reference = self.reference[name]
+                drift[name] = {
+                    'reference': reference.as_dict(),
+                    'live': live.as_dict(),
+                    'psi': population_stability_index(reference, live) if live.total else None,
+                    'ks': ks_statistic(reference, live) if live.total else None,
+                }
+            return {
+                'batches': self.n_batches,
+                'errors': {name: metrics.as_dict() for name, metrics in self.errors.items()},
+                'drift': drift,
+            }
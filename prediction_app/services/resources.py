@@ -0,0 +1,133 @@
+# prediction_app/services/resources.py
+"""
+Accès paresseux aux ressources lourdes de l'application (modèles, données de référence, état partagé).
+Aucun import de pandas/joblib/xgboost n'a lieu à l'import de ce module : chaque ressource est
+chargée au premier appel de son accesseur, une seule fois par processus. warm_up() permet de tout
+charger à l'avance, par exemple dans le processus maître avant le fork des workers.
+"""
+import functools
+import os
+import threading
+import time
+
+# --- Chemins ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODEL_DIR = os.path.join(BASE_DIR, 'saved_models')
+RAW_DATA_PATH = os.path.join(BASE_DIR, 'data', 'raw', 'passengers_casatramway_raw.csv')
+EVENTS_HOLIDAYS_PATH = os.path.join(BASE_DIR, 'data', 'raw', 'events_holidays.csv')
+PROCESSED_DATA_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'passengers_casatramway_processed.csv')
+
+MODEL_FILES = [('XGBoost', 'xgboost_model.pkl'),
+               ('Random Forest', 'random_forest_model.pkl'),
+               ('Linear Regression', 'linear_regression_model.pkl')]
+
+
+def _load_once(loader):
+    """Décorateur : exécute loader au premier appel seulement, même en cas d'appels concurrents."""
+    lock = threading.Lock()
+    sentinel = object()
+    state = {'value': sentinel}
+
+    @functools.wraps(loader)
+    def accessor():
+        if state['value'] is sentinel:
+            with lock:
+                if state['value'] is sentinel:
+                    state['value'] = loader()
+        return state['value']
+
+    accessor.is_loaded = lambda: state['value'] is not sentinel
+    return accessor
+
+
+@_load_once
+def get_events_holidays():
+    """DataFrame des événements/jours fériés (vide si le fichier est illisible)."""
+    import pandas as pd
+    from .data_processing import load_events_holidays_data
+    try:
+        return load_events_holidays_data(EVENTS_HOLIDAYS_PATH)
+    except Exception as e:
+        print(f"Avertissement : impossible de charger {EVENTS_HOLIDAYS_PATH} : {e}")
+        return pd.DataFrame()
+
+
+@_load_once
+def get_lag_store():
+    """Mémoire des séries pour les features de décalage, initialisée avec la fin de l'historique."""
+    import pandas as pd
+    from .lag_features import LagFeatureStore
+    store = LagFeatureStore()
+    try:
+        store.update(pd.read_csv(RAW_DATA_PATH).rename(columns={'Nb_Passagers': 'Passagers_Reels'}))
+    except Exception as e:
+        print(f"Avertissement : impossible d'initialiser l'historique des features de décalage : {e}")
+    return store
+
+
+@_load_once
+def get_models():
+    """Modèles ML chargés, avec leur version (empreinte du fichier) : (MODELS, MODEL_VERSIONS)."""
+    import joblib
+    from .audit_log import hash_file
+    models, versions = {}, {}
+    for name, filename in MODEL_FILES:
+        try:
+            models[name] = joblib.load(os.path.join(MODEL_DIR, filename))
+            versions[name] = hash_file(os.path.join(MODEL_DIR, filename))
+            print(f"{name} chargé avec succès")
+        except Exception as e:
+            print(f"Erreur chargement {name} : {e}")
+    return models, versions
+
+
+@_load_once
+def get_audit_writer():
+    """Journal d'audit des prédictions (son thread d'écriture ne démarre qu'au premier submit)."""
+    from .audit_log import AuditLogWriter
+    return AuditLogWriter()
+
+
+@_load_once
+def get_monitor():
+    """Suivi de la précision et de la dérive, avec les distributions de référence d'entraînement."""
+    from .monitoring import DriftMonitor
+    try:
+        return DriftMonitor.from_training_data(PROCESSED_DATA_PATH)
+    except Exception as e:
+        print(f"Avertissement : impossible d'initialiser le suivi de dérive : {e}")
+        return DriftMonitor({})
+
+
+ACCESSORS = [get_events_holidays, get_lag_store, get_models, get_audit_writer, get_monitor]
+
+
+def warm_up():
+    """
+    Charge toutes les ressources et retourne la durée de chargement de chacune (en secondes).
+    N'ouvre ni connexion à la base ni thread : sans risque avant un fork.
+    """
+    timings = {}
+    for accessor in ACCESSORS:
+        start = time.perf_counter()
+        accessor()
+        timings[accessor.__name__] = time.perf_counter() - start
+    return timings
+
+
+def warm_up_if_enabled():
+    """
+    Préchargement au démarrage du serveur, si PREDICTION_WARM_UP est actif.
+    Appelé depuis wsgi.py/asgi.py et non depuis AppConfig.ready() : les commandes de gestion
+    (migrate, shell...) et le processus parent de l'autoreloader de runserver ne chargent pas
+    l'application WSGI et ne paient donc pas ce coût. Avec un serveur prefork qui charge
+    l'application avant le fork (ex. gunicorn --preload), il s'exécute une seule fois dans le
+    processus maître et les workers héritent des objets déjà en mémoire.
+    """
+    from django.conf import settings
+    if not getattr(settings, 'PREDICTION_WARM_UP', False):
+        return None
+    timings = warm_up()
+    details = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+    print(f"Préchargement terminé en {sum(timings.values()):.2f}s ({details})")
+    return timings
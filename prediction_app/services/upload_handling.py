@@ -0,0 +1,120 @@
+# prediction_app/services/upload_handling.py
+import gzip
+import io
+
+import pandas as pd
+from django.conf import settings
+
+from ..upload_handlers import max_upload_size, size_limit_message
+
+try:
+    import zstandard
+except ImportError:  # Dépendance optionnelle : seuls les CSV .zst en ont besoin
+    zstandard = None
+
+# Valeur par défaut si PREDICTION_MAX_DECOMPRESSED_SIZE n'est pas défini dans settings.py
+DEFAULT_MAX_DECOMPRESSED_SIZE = 200 * 1024 * 1024
+CSV_CHUNK_ROWS = 50_000
+
+REQUIRED_COLUMNS = ['Date']
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+class _SizeLimitedReader(io.RawIOBase):
+    """Flux binaire en lecture seule qui refuse de dépasser max_bytes (protège des bombes de décompression)."""
+
+    def __init__(self, stream, max_bytes):
+        self._stream = stream
+        self._max_bytes = max_bytes
+        self._read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        self._read += len(data)
+        if self._read > self._max_bytes:
+            raise ValueError(size_limit_message(self._max_bytes, subject='Le fichier décompressé'))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def max_decompressed_size():
+    """Taille maximale (en octets) d'un CSV une fois décompressé, lue dans les settings à chaque appel."""
+    return getattr(settings, 'PREDICTION_MAX_DECOMPRESSED_SIZE', DEFAULT_MAX_DECOMPRESSED_SIZE)
+
+
+def detect_compression(uploaded_file):
+    """Détecte la compression d'un fichier uploadé via ses premiers octets ('gzip', 'zstd' ou None)."""
+    uploaded_file.seek(0)
+    header = uploaded_file.read(4)
+    uploaded_file.seek(0)
+    if header.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if header.startswith(ZSTD_MAGIC):
+        return 'zstd'
+    return None
+
+
+def open_upload_stream(uploaded_file):
+    """
+    Ouvre le fichier uploadé comme un flux binaire, décompressé à la volée si nécessaire.
+    Aucune copie n'est écrite sur disque : on lit directement l'UploadedFile reçu en mémoire.
+    La taille reçue est déjà plafonnée pendant la réception par BoundedMemoryFileUploadHandler ;
+    ce contrôle reste une seconde barrière.
+    """
+    if uploaded_file.size > max_upload_size():
+        raise ValueError(size_limit_message())
+
+    compression = detect_compression(uploaded_file)
+    if compression == 'gzip':
+        stream = gzip.GzipFile(fileobj=uploaded_file, mode='rb')
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("Les fichiers compressés en zstd nécessitent le paquet 'zstandard'.")
+        stream = zstandard.ZstdDecompressor().stream_reader(uploaded_file)
+    else:
+        return uploaded_file, None
+
+    return io.BufferedReader(_SizeLimitedReader(stream, max_decompressed_size())), compression
+
+
+def validate_csv_schema(df, required_columns=REQUIRED_COLUMNS):
+    """Vérifie les colonnes obligatoires et le format des dates sur un (premier) bloc du CSV."""
+    missing = [col for col in required_columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"Le fichier CSV uploadé doit contenir les colonnes : {', '.join(missing)}.")
+    if df.empty:
+        raise ValueError("Le fichier CSV uploadé ne contient aucune ligne.")
+    if 'Date' in required_columns:
+        invalid = pd.to_datetime(df['Date'], errors='coerce').isna()
+        if invalid.any():
+            raise ValueError(f"Date invalide dans le fichier CSV : '{df.loc[invalid, 'Date'].iloc[0]}'.")
+
+
+def read_uploaded_csv(uploaded_file, required_columns=REQUIRED_COLUMNS):
+    """
+    Lit un CSV uploadé en DataFrame sans fichier temporaire.
+    - Petit fichier non compressé (au plus FILE_UPLOAD_MAX_MEMORY_SIZE octets) : parsé d'un bloc.
+    - Gros fichier ou fichier gzip/zstd : parsé par blocs de CSV_CHUNK_ROWS lignes ;
+      le schéma est validé dès le premier bloc, avant de lire la suite du fichier.
+    """
+    stream, compression = open_upload_stream(uploaded_file)
+
+    if compression is None and uploaded_file.size <= settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+        df = pd.read_csv(stream)
+        validate_csv_schema(df, required_columns)
+        return df
+
+    chunks = []
+    with pd.read_csv(stream, chunksize=CSV_CHUNK_ROWS) as reader:
+        for chunk in reader:
+            if not chunks:
+                validate_csv_schema(chunk, required_columns)
+            chunks.append(chunk)
+    if not chunks:
+        raise ValueError("Le fichier CSV uploadé ne contient aucune ligne.")
+    return pd.concat(chunks, ignore_index=True)
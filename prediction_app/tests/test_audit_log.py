@@ -0,0 +1,112 @@
+# prediction_app/tests/test_audit_log.py
+from django.test import TestCase
+from unittest import mock
+from django.db import DatabaseError
+import numpy as np
+import pandas as pd
+from prediction_app.models import PredictionRun, PredictionRecord
+from prediction_app.services.audit_log import AuditLogWriter, hash_dataframe
+
+class AuditLogTests(TestCase):
+
+    def setUp(self):
+        self.df_predictions = pd.DataFrame({
+            'Date': pd.to_datetime(['2023-01-01', '2023-01-02', '2023-01-03']),
+            'Passagers_Reels': [1000, np.nan, 1100],
+            'Predictions': [980.5, 1210.0, 1090.2],
+        })
+        self.df_input = pd.DataFrame({'Date': ['2023-01-01', '2023-01-02', '2023-01-03'],
+                                      'Nb_Passagers': [1000, None, 1100]})
+
+    def test_submit_is_buffered_until_flush(self):
+        writer = AuditLogWriter(autostart=False)
+        elapsed = writer.submit('XGBoost', 'abc123', self.df_input, self.df_predictions)
+        self.assertGreaterEqual(elapsed, 0)
+        self.assertEqual(len(writer), 3)
+        self.assertEqual(PredictionRecord.objects.count(), 0)
+
+        self.assertEqual(writer.flush(), 3)
+        self.assertEqual(len(writer), 0)
+        self.assertEqual(writer.stats['rows_written'], 3)
+
+        run = PredictionRun.objects.get()
+        self.assertEqual(run.model_version, 'abc123')
+        self.assertEqual(run.input_hash, hash_dataframe(self.df_input))
+        self.assertEqual(run.n_rows, 3)
+        self.assertEqual(run.records.count(), 3)
+        self.assertIsNone(PredictionRecord.objects.get(date='2023-01-02').actual)
+
+    def test_flush_batches_several_runs(self):
+        writer = AuditLogWriter(batch_size=2, autostart=False)
+        writer.submit('XGBoost', 'v1', self.df_input, self.df_predictions)
+        writer.submit('Linear Regression', 'v2', self.df_input, self.df_predictions)
+        writer.flush()
+
+        self.assertEqual(PredictionRun.objects.count(), 2)
+        in_range = PredictionRecord.objects.filter(model_name='XGBoost', date__range=('2023-01-02', '2023-01-03'))
+        self.assertEqual(in_range.count(), 2)
+
+    def test_hash_dataframe_is_stable(self):
+        df = self.df_predictions[['Date', 'Passagers_Reels']]
+        self.assertEqual(hash_dataframe(df), hash_dataframe(df.copy()))
+        self.assertNotEqual(hash_dataframe(df), hash_dataframe(df.assign(Passagers_Reels=0)))
+
+    def test_failed_flush_is_requeued(self):
+        writer = AuditLogWriter(autostart=False)
+        writer.submit('XGBoost', 'v1', self.df_input, self.df_predictions)
+        with mock.patch.object(PredictionRecord.objects, 'bulk_create', side_effect=DatabaseError('base verrouillée')):
+            self.assertEqual(writer.flush(), 0)
+
+        self.assertEqual(len(writer), 3)
+        self.assertEqual(PredictionRun.objects.count(), 0)  # Transaction annulée
+        self.assertEqual(writer.stats['rows_requeued'], 3)
+
+        self.assertEqual(writer.flush(), 3)
+        self.assertEqual(PredictionRecord.objects.count(), 3)
+
+    def test_failing_run_is_isolated_then_abandoned(self):
+        writer = AuditLogWriter(max_attempts=2, autostart=False)
+        writer.submit('Modele Invalide', 'v0', self.df_input, self.df_predictions)
+        writer.submit('XGBoost', 'v1', self.df_input, self.df_predictions)
+        bulk_create = PredictionRecord.objects.bulk_create
+
+        def failing_bulk_create(records, **kwargs):
+            if any(record.model_name == 'Modele Invalide' for record in records):
+                raise DatabaseError('valeur refusée')
+            return bulk_create(records, **kwargs)
+
+        with mock.patch.object(PredictionRecord.objects, 'bulk_create', side_effect=failing_bulk_create):
+            self.assertEqual(writer.flush(), 3)  # L'exécution valide passe malgré l'autre
+            self.assertEqual(len(writer), 3)
+            self.assertEqual(writer.flush(), 0)
+
+        self.assertEqual(len(writer), 0)
+        self.assertEqual(writer.stats['runs_abandoned'], 1)
+        self.assertEqual(PredictionRun.objects.get().model_name, 'XGBoost')
+
+    def test_submit_buffers_columns_only(self):
+        writer = AuditLogWriter(autostart=False)
+        with mock.patch('prediction_app.services.audit_log.PredictionRecord') as record_class:
+            writer.submit('XGBoost', 'v1', self.df_input, self.df_predictions)
+        record_class.assert_not_called()
+        self.df_predictions.loc[0, 'Predictions'] = 0.0  # Le tampon ne dépend plus du DataFrame
+        writer.flush()
+        self.assertEqual(PredictionRecord.objects.get(date='2023-01-01').predicted, 980.5)
+
+    def test_pending_rows_are_capped(self):
+        writer = AuditLogWriter(max_pending=4, autostart=False)
+        writer.submit('XGBoost', 'v1', self.df_input, self.df_predictions)
+        writer.submit('XGBoost', 'v2', self.df_input, self.df_predictions)
+        self.assertEqual(len(writer), 3)
+        self.assertEqual(writer.stats['rows_dropped'], 3)
+
+        writer.flush()
+        self.assertEqual(PredictionRun.objects.get().model_version, 'v2')
+
+    def test_snapshot_reports_request_overhead(self):
+        writer = AuditLogWriter(autostart=False)
+        writer.submit('XGBoost', 'v1', self.df_input, self.df_predictions)
+        snapshot = writer.snapshot()
+        self.assertEqual(snapshot['submits'], 1)
+        self.assertEqual(snapshot['pending_rows'], 3)
+        self.assertGreater(snapshot['submit_ms_mean'], 0)
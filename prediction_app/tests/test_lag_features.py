@@ -0,0 +1,110 @@
+# prediction_app/tests/test_lag_features.py
+from django.test import TestCase
+import numpy as np
+import pandas as pd
+from prediction_app.services.data_processing import preprocess_data
+from prediction_app.services.lag_features import (
+    create_lag_features, lag_feature_columns, LagFeatureStore, HISTORY_HORIZON_DAYS
+)
+
+class LagFeaturesTests(TestCase):
+
+    def setUp(self):
+        dates = pd.date_range('2022-01-01', periods=400, freq='D')
+        self.df_history = pd.DataFrame({
+            'Date': dates,
+            'Passagers_Reels': np.arange(400, dtype=float) * 10 + 1000,
+        })
+
+    def test_create_lag_features_columns_and_values(self):
+        df = create_lag_features(self.df_history.copy())
+        for col in lag_feature_columns():
+            self.assertIn(col, df.columns, f"Colonne manquante: {col}")
+
+        last = df.iloc[-1]
+        self.assertEqual(last['Passagers_Lag_1'], df.iloc[-2]['Passagers_Reels'])
+        self.assertEqual(last['Passagers_Lag_7'], df.iloc[-8]['Passagers_Reels'])
+        self.assertEqual(last['Passagers_Lag_364'], df.iloc[-365]['Passagers_Reels'])
+        # La moyenne glissante exclut le jour courant
+        self.assertAlmostEqual(last['Passagers_Moyenne_Mobile_7'], df['Passagers_Reels'].iloc[-8:-1].mean())
+        self.assertTrue(np.isnan(df.iloc[0]['Passagers_Lag_1']))
+
+    def test_lags_are_calendar_based(self):
+        # Un jour manquant ne doit pas décaler les lignes suivantes
+        df = self.df_history.iloc[:10].drop(index=5).copy()
+        df = create_lag_features(df)
+        self.assertTrue(np.isnan(df.loc[6, 'Passagers_Lag_1']))
+        self.assertEqual(df.loc[7, 'Passagers_Lag_1'], df.loc[6, 'Passagers_Reels'])
+
+    def test_grouped_series_do_not_mix(self):
+        df = pd.DataFrame({
+            'Ligne': ['T1', 'T2', 'T1', 'T2'],
+            'Date': pd.to_datetime(['2023-01-01', '2023-01-01', '2023-01-02', '2023-01-02']),
+            'Passagers_Reels': [100.0, 5000.0, 110.0, 5100.0],
+        })
+        df = create_lag_features(df, group_cols=['Ligne'])
+        self.assertEqual(df.loc[2, 'Passagers_Lag_1'], 100.0)
+        self.assertEqual(df.loc[3, 'Passagers_Lag_1'], 5000.0)
+        self.assertEqual(df.loc[3, 'Passagers_Moyenne_Mobile_7'], 5000.0)
+
+    def test_store_matches_full_recomputation(self):
+        store = LagFeatureStore().update(self.df_history.iloc[:390])
+        self.assertLessEqual(len(store), HISTORY_HORIZON_DAYS + 1)
+
+        df_new = self.df_history.iloc[390:].copy()
+        df_incremental = store.transform(df_new.copy())
+        df_full = create_lag_features(self.df_history.copy()).iloc[390:]
+
+        cols = lag_feature_columns()
+        pd.testing.assert_frame_equal(df_incremental[cols], df_full[cols])
+
+    def test_store_forecast_rows_keep_known_actuals(self):
+        # Lot de prévision (sans cible) recouvrant des dates déjà connues de la mémoire
+        store = LagFeatureStore().update(self.df_history)
+        dates = self.df_history['Date'].iloc[-6:-2]
+        df_forecast = store.transform(pd.DataFrame({'Date': dates.to_numpy()}))
+        df_full = create_lag_features(self.df_history.copy()).iloc[-6:-2]
+
+        # Lag_364 exclu : la mémoire ne conserve que HISTORY_HORIZON_DAYS jours
+        cols = [col for col in lag_feature_columns() if col != 'Passagers_Lag_364']
+        pd.testing.assert_frame_equal(df_forecast[cols].reset_index(drop=True),
+                                      df_full[cols].reset_index(drop=True))
+        self.assertFalse(df_forecast['Passagers_Lag_1'].isna().any())
+
+    def test_store_transform_is_read_only(self):
+        store = LagFeatureStore().update(self.df_history)
+        df_future = pd.DataFrame({'Date': pd.date_range('2023-02-05', periods=2, freq='D'),
+                                  'Passagers_Reels': [1.0, 2.0]})
+        df_future = store.transform(df_future)
+        self.assertEqual(df_future.iloc[0]['Passagers_Lag_1'], self.df_history.iloc[-1]['Passagers_Reels'])
+        self.assertEqual(len(store), HISTORY_HORIZON_DAYS + 1)
+        self.assertEqual(store.tail['Date'].max(), self.df_history['Date'].max())
+
+    def test_store_rejects_observations_outside_horizon(self):
+        store = LagFeatureStore().update(self.df_history)
+        tail_before = store.tail
+
+        # Une date lointaine ne doit pas tronquer l'historique amorcé
+        store.update(pd.DataFrame({'Date': pd.to_datetime(['2030-01-01']), 'Passagers_Reels': [5.0]}))
+        # Ni une valeur plus ancienne que l'horizon conservé
+        store.update(pd.DataFrame({'Date': pd.to_datetime(['2022-01-05']), 'Passagers_Reels': [5.0]}))
+        pd.testing.assert_frame_equal(store.tail, tail_before)
+
+        df_next = store.transform(pd.DataFrame({'Date': pd.to_datetime(['2023-02-05'])}))
+        self.assertFalse(np.isnan(df_next.iloc[0]['Passagers_Lag_1']))
+        self.assertFalse(np.isnan(df_next.iloc[0]['Passagers_Moyenne_Mobile_7']))
+
+        # Le jour suivant, issu d'une source fiable, est bien intégré
+        store.update(pd.DataFrame({'Date': pd.to_datetime(['2023-02-05']), 'Passagers_Reels': [5.0]}))
+        self.assertEqual(store.tail['Date'].max(), pd.Timestamp('2023-02-05'))
+
+    def test_preprocess_data_does_not_modify_store(self):
+        store = LagFeatureStore().update(self.df_history)
+        tail_before = store.tail
+        df_upload = pd.DataFrame({'Date': ['2030-01-01'], 'Nb_Passagers': [5]})
+        df_processed = preprocess_data(df_upload, lag_store=store)
+        self.assertIn('Passagers_Lag_1', df_processed.columns)
+        pd.testing.assert_frame_equal(store.tail, tail_before)
+
+        df_history = preprocess_data(df_upload, lag_features=False)
+        self.assertNotIn('Passagers_Lag_1', df_history.columns)
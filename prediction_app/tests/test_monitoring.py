@@ -0,0 +1,107 @@
+# prediction_app/tests/test_monitoring.py
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from unittest import mock
+import numpy as np
+import pandas as pd
+from prediction_app.services import resources
+from prediction_app.services.audit_log import AuditLogWriter
+from prediction_app.services.monitoring import (
+    RunningErrorMetrics, FeatureSketch, DriftMonitor, population_stability_index, ks_statistic
+)
+
+class MonitoringTests(TestCase):
+
+    def test_running_error_metrics_match_batch_computation(self):
+        actual = np.array([100.0, 200.0, np.nan, 400.0])
+        predicted = np.array([110.0, 190.0, 300.0, 380.0])
+        metrics = RunningErrorMetrics(half_life=None)
+        metrics.update(actual[:2], predicted[:2]).update(actual[2:], predicted[2:])
+        result = metrics.as_dict()
+
+        error = np.array([10.0, -10.0, -20.0])
+        self.assertEqual(result['count'], 3)
+        self.assertAlmostEqual(result['mae'], np.abs(error).mean())
+        self.assertAlmostEqual(result['rmse'], np.sqrt((error ** 2).mean()))
+        self.assertAlmostEqual(result['bias'], error.mean())
+
+    def test_feature_sketch_incremental_moments(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(15, 5, 1000)
+        sketch = FeatureSketch.from_values(values[:100])
+        for batch in np.array_split(values[100:], 7):
+            sketch.update(batch)
+        self.assertEqual(sketch.n, 1000)
+        self.assertAlmostEqual(sketch.mean, values.mean())
+        self.assertAlmostEqual(sketch.as_dict()['std'], values.std(ddof=1))
+        self.assertEqual(sketch.counts.sum(), 1000)
+
+    def test_drift_scores(self):
+        rng = np.random.default_rng(1)
+        reference = FeatureSketch.from_values(rng.normal(15, 5, 5000))
+        same = reference.empty_like().update(rng.normal(15, 5, 2000))
+        shifted = reference.empty_like().update(rng.normal(25, 5, 2000))
+
+        self.assertLess(population_stability_index(reference, same), 0.1)
+        self.assertGreater(population_stability_index(reference, shifted), 0.25)
+        self.assertLess(ks_statistic(reference, same), ks_statistic(reference, shifted))
+
+    def test_drift_monitor_snapshot(self):
+        reference = {'Temperature_Moyenne_C': FeatureSketch.from_values(np.linspace(0, 30, 300))}
+        monitor = DriftMonitor(reference)
+        df = pd.DataFrame({
+            'Temperature_Moyenne_C': [10.0, 20.0],
+            'Passagers_Reels': [1000.0, np.nan],
+            'Predictions': [900.0, 1500.0],
+        })
+        monitor.update('XGBoost', df, uploaded_columns=['Date', 'Temperature_Moyenne_C'])
+        snapshot = monitor.snapshot()
+
+        self.assertEqual(snapshot['batches'], 1)
+        self.assertEqual(snapshot['errors']['XGBoost']['mae'], 100.0)
+        self.assertEqual(snapshot['drift']['Temperature_Moyenne_C']['live']['count'], 2)
+        self.assertIsNotNone(snapshot['drift']['Temperature_Moyenne_C']['psi'])
+
+    def test_late_drift_is_not_diluted(self):
+        rng = np.random.default_rng(2)
+        monitor = DriftMonitor({'Temperature_Moyenne_C': FeatureSketch.from_values(rng.normal(15, 5, 5000))},
+                               half_life=500)
+        for _ in range(100):
+            monitor.update('XGBoost', pd.DataFrame({'Temperature_Moyenne_C': rng.normal(15, 5, 1000)}))
+        self.assertLess(monitor.snapshot()['drift']['Temperature_Moyenne_C']['psi'], 0.1)
+
+        # Après 100 000 lignes stables, 2 000 lignes décalées suffisent à faire réagir le PSI
+        for _ in range(2):
+            monitor.update('XGBoost', pd.DataFrame({'Temperature_Moyenne_C': rng.normal(25, 5, 1000)}))
+        self.assertGreater(monitor.snapshot()['drift']['Temperature_Moyenne_C']['psi'], 0.25)
+
+    def test_recent_errors_dominate(self):
+        metrics = RunningErrorMetrics(half_life=100)
+        metrics.update(np.full(10_000, 100.0), np.full(10_000, 101.0))
+        metrics.update(np.full(1_000, 100.0), np.full(1_000, 150.0))
+        self.assertGreater(metrics.as_dict()['mae'], 49)
+        self.assertEqual(metrics.as_dict()['count'], 11_000)
+
+    def test_features_missing_from_upload_are_skipped(self):
+        reference = {'Temperature_Moyenne_C': FeatureSketch.from_values(np.linspace(0, 30, 300)),
+                     'Precipitations_mm': FeatureSketch.from_values(np.linspace(0, 10, 300))}
+        monitor = DriftMonitor(reference)
+        # Météo simulée par le prétraitement : absente du CSV uploadé
+        df = pd.DataFrame({'Temperature_Moyenne_C': [12.0], 'Precipitations_mm': [1.0]})
+        monitor.update('XGBoost', df, uploaded_columns=['Date', 'Precipitations_mm'])
+        drift = monitor.snapshot()['drift']
+        self.assertEqual(drift['Temperature_Moyenne_C']['live']['count'], 0)
+        self.assertEqual(drift['Precipitations_mm']['live']['count'], 1)
+
+    def test_monitoring_view_is_staff_only_and_process_scoped(self):
+        url = reverse('monitoring_view')
+        self.assertEqual(self.client.get(url).status_code, 302)  # Redirection vers la connexion admin
+
+        self.client.force_login(User.objects.create_user('equipe', is_staff=True))
+        with mock.patch.object(resources, 'get_monitor', return_value=DriftMonitor({})), \
+                mock.patch.object(resources, 'get_audit_writer', return_value=AuditLogWriter(autostart=False)):
+            payload = self.client.get(url).json()
+        self.assertEqual(payload['scope'], 'process')
+        self.assertIn('pid', payload)
+        self.assertEqual(payload['audit']['pending_rows'], 0)
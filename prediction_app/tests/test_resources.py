@@ -0,0 +1,46 @@
+# prediction_app/tests/test_resources.py
+from django.test import TestCase, override_settings
+from unittest import mock
+from prediction_app.services import resources
+
+class ResourcesTests(TestCase):
+
+    def test_load_once_runs_loader_a_single_time(self):
+        calls = []
+
+        @resources._load_once
+        def get_value():
+            calls.append(1)
+            return {'valeur': 42}
+
+        self.assertFalse(get_value.is_loaded())
+        self.assertIs(get_value(), get_value())
+        self.assertTrue(get_value.is_loaded())
+        self.assertEqual(len(calls), 1)
+
+    def test_warm_up_loads_every_resource(self):
+        # Chargeurs factices : les vrais singletons (modèles, mémoire des séries) restent intacts
+        @resources._load_once
+        def get_first():
+            return 'premier'
+
+        @resources._load_once
+        def get_second():
+            return 'second'
+
+        with mock.patch.object(resources, 'ACCESSORS', [get_first, get_second]):
+            timings = resources.warm_up()
+
+        self.assertListEqual(list(timings), ['get_first', 'get_second'])
+        self.assertTrue(get_first.is_loaded())
+        self.assertTrue(get_second.is_loaded())
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+
+    def test_warm_up_only_when_enabled(self):
+        with mock.patch.object(resources, 'warm_up', return_value={'get_models': 0.5}) as warm_up:
+            with override_settings(PREDICTION_WARM_UP=False):
+                self.assertIsNone(resources.warm_up_if_enabled())
+            warm_up.assert_not_called()
+            with override_settings(PREDICTION_WARM_UP=True), mock.patch('builtins.print'):
+                self.assertEqual(resources.warm_up_if_enabled(), {'get_models': 0.5})
+            warm_up.assert_called_once()
@@ -0,0 +1,100 @@
+# prediction_app/tests/test_upload_handling.py
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile, InMemoryUploadedFile
+from unittest import mock, skipUnless
+import gzip
+from prediction_app.services import upload_handling
+from prediction_app.services.upload_handling import read_uploaded_csv, detect_compression
+from prediction_app.upload_handlers import BoundedMemoryFileUploadHandler
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CSV_CONTENT = b"Date,Nb_Passagers\n2023-01-01,1000\n2023-01-02,1200\n2023-01-03,1100\n"
+
+class UploadHandlingTests(TestCase):
+
+    def test_read_small_csv_in_memory(self):
+        uploaded = SimpleUploadedFile('data.csv', CSV_CONTENT, content_type='text/csv')
+        df = read_uploaded_csv(uploaded)
+        self.assertEqual(len(df), 3)
+        self.assertListEqual(df.columns.tolist(), ['Date', 'Nb_Passagers'])
+
+    def test_read_gzip_csv(self):
+        uploaded = SimpleUploadedFile('data.csv.gz', gzip.compress(CSV_CONTENT))
+        self.assertEqual(detect_compression(uploaded), 'gzip')
+        df = read_uploaded_csv(uploaded)
+        self.assertEqual(df['Nb_Passagers'].sum(), 3300)
+
+    @skipUnless(zstandard, "paquet 'zstandard' non installé")
+    def test_read_zstd_csv(self):
+        uploaded = SimpleUploadedFile('data.csv.zst', zstandard.ZstdCompressor().compress(CSV_CONTENT))
+        self.assertEqual(detect_compression(uploaded), 'zstd')
+        df = read_uploaded_csv(uploaded)
+        self.assertEqual(df['Nb_Passagers'].sum(), 3300)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_large_csv_is_read_by_chunks(self):
+        with mock.patch.object(upload_handling, 'CSV_CHUNK_ROWS', 2):
+            df = read_uploaded_csv(SimpleUploadedFile('data.csv', CSV_CONTENT))
+        self.assertEqual(len(df), 3)
+        self.assertListEqual(df.index.tolist(), [0, 1, 2])
+
+    def test_schema_rejected_on_first_chunk(self):
+        content = b"Jour,Nb_Passagers\n" + b"2023-01-01,1000\n" * 10 + b"pas,un,csv,valide\n"
+        with override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0), \
+             mock.patch.object(upload_handling, 'CSV_CHUNK_ROWS', 2):
+            with self.assertRaisesRegex(ValueError, 'Date'):
+                read_uploaded_csv(SimpleUploadedFile('data.csv', content))
+
+    def test_invalid_date_rejected(self):
+        uploaded = SimpleUploadedFile('data.csv', b"Date\n2023-01-01\npas-une-date\n")
+        with self.assertRaisesRegex(ValueError, 'Date invalide'):
+            read_uploaded_csv(uploaded)
+
+    def test_size_limits(self):
+        with override_settings(PREDICTION_MAX_UPLOAD_SIZE=10):
+            with self.assertRaisesRegex(ValueError, 'taille maximale'):
+                read_uploaded_csv(SimpleUploadedFile('data.csv', CSV_CONTENT))
+
+        bomb = gzip.compress(b"Date\n" + b"2023-01-01\n" * 10000)
+        with override_settings(PREDICTION_MAX_DECOMPRESSED_SIZE=1000):
+            with self.assertRaisesRegex(ValueError, 'décompressé'):
+                read_uploaded_csv(SimpleUploadedFile('data.csv.gz', bomb))
+
+    def _post_upload(self, content):
+        request = RequestFactory().post('/', {'model_choice': 'XGBoost',
+                                              'csv_file': SimpleUploadedFile('data.csv', content)})
+        return request, request.FILES
+
+    def test_upload_handler_keeps_file_in_memory(self):
+        request, files = self._post_upload(CSV_CONTENT)
+        self.assertIsInstance(request.upload_handlers[0], BoundedMemoryFileUploadHandler)
+        self.assertIsInstance(files['csv_file'], InMemoryUploadedFile)
+        self.assertEqual(files['csv_file'].read(), CSV_CONTENT)
+        self.assertEqual(request.POST['model_choice'], 'XGBoost')
+        self.assertFalse(getattr(request, 'upload_too_large', False))
+
+        # Au-delà de FILE_UPLOAD_MAX_MEMORY_SIZE, le fichier reste en mémoire (pas de fichier temporaire)
+        request, files = self._post_upload(b"Date\n" + b"2023-01-01\n" * 300_000)
+        self.assertIsInstance(files['csv_file'], InMemoryUploadedFile)
+
+    @override_settings(PREDICTION_MAX_UPLOAD_SIZE=1024)
+    def test_upload_handler_stops_oversized_upload(self):
+        # Plus gros que FILE_UPLOAD_MAX_MEMORY_SIZE : ne doit pas passer par un fichier temporaire
+        request, files = self._post_upload(b"Date\n" + b"2023-01-01\n" * 300_000)
+        self.assertNotIn('csv_file', files)
+        self.assertTrue(request.upload_too_large)
+        self.assertEqual(request.POST['model_choice'], 'XGBoost')
+
+    @override_settings(PREDICTION_MAX_UPLOAD_SIZE=1024 * 1024)
+    def test_oversized_upload_reports_size_error(self):
+        response = self.client.post(reverse('predict_view'), {
+            'model_choice': 'XGBoost',
+            'csv_file': SimpleUploadedFile('data.csv', b"Date\n" + b"2023-01-01\n" * 200_000),
+        })
+        errors = [str(message) for message in response.context['messages']]
+        self.assertIn("Erreur de données : Le fichier dépasse la taille maximale autorisée (1 Mo).", errors)
@@ -0,0 +1,60 @@
+# prediction_app/upload_handlers.py
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers, StopUpload
+
+# Valeur par défaut si PREDICTION_MAX_UPLOAD_SIZE n'est pas défini dans settings.py
+DEFAULT_MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+
+
+def max_upload_size():
+    """Taille maximale (en octets) d'un fichier uploadé, lue dans les settings à chaque appel."""
+    return getattr(settings, 'PREDICTION_MAX_UPLOAD_SIZE', DEFAULT_MAX_UPLOAD_SIZE)
+
+
+def size_limit_message(max_bytes=None, subject='Le fichier'):
+    """Message d'erreur commun aux dépassements de taille (upload ou décompression)."""
+    max_bytes = max_upload_size() if max_bytes is None else max_bytes
+    return f"{subject} dépasse la taille maximale autorisée ({max_bytes // (1024 * 1024)} Mo)."
+
+
+class BoundedMemoryFileUploadHandler(FileUploadHandler):
+    """
+    Reçoit les fichiers uploadés en mémoire, sans jamais les écrire dans un fichier temporaire,
+    et interrompt l'upload dès que PREDICTION_MAX_UPLOAD_SIZE octets ont été reçus.
+    Le dépassement est signalé par request.upload_too_large ; le reste du corps de la requête
+    est lu puis ignoré par Django, sans être stocké.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = max_upload_size()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = BytesIO()
+        self.received = 0
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.file.close()
+            if self.request is not None:
+                self.request.upload_too_large = True
+            raise StopUpload(connection_reset=False)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        return InMemoryUploadedFile(
+            file=self.file,
+            field_name=self.field_name,
+            name=self.file_name,
+            content_type=self.content_type,
+            size=file_size,
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+        )
@@ -4,5 +4,6 @@ from . import views
 
 urlpatterns = [
     path('', views.predict_view, name='predict_view'),
+    path('monitoring/', views.monitoring_view, name='monitoring_view'),
 ]
 
@@ -1,36 +1,17 @@
 from django.shortcuts import render
-from django.core.files.storage import FileSystemStorage
+from django.http import JsonResponse
 from django.contrib import messages
-import pandas as pd
-import joblib
-import os
+from django.contrib.admin.views.decorators import staff_member_required
 import json
-from .services.data_processing import preprocess_data, load_events_holidays_data
-
-# --- Chemins ---
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-MODEL_DIR = os.path.join(BASE_DIR, 'saved_models')
-RAW_DATA_PATH = os.path.join(BASE_DIR, 'data', 'raw', 'passengers_casatramway_raw.csv')
-EVENTS_HOLIDAYS_PATH = os.path.join(BASE_DIR, 'data', 'raw', 'events_holidays.csv')
-MEDIA_ROOT_DIR = os.path.join(BASE_DIR, 'media')
-
-# --- Chargement des événements/vacances ---
-try:
-    EVENTS_HOLIDAYS_DF = load_events_holidays_data(EVENTS_HOLIDAYS_PATH)
-except Exception as e:
-    EVENTS_HOLIDAYS_DF = pd.DataFrame()
-    print(f"Avertissement : impossible de charger {EVENTS_HOLIDAYS_PATH} : {e}")
-
-# --- Chargement des modèles ML ---
-MODELS = {}
-for name, filename in [('XGBoost','xgboost_model.pkl'),
-                       ('Random Forest','random_forest_model.pkl'),
-                       ('Linear Regression','linear_regression_model.pkl')]:
-    try:
-        MODELS[name] = joblib.load(os.path.join(MODEL_DIR, filename))
-        print(f"{name} chargé avec succès")
-    except Exception as e:
-        print(f"Erreur chargement {name} : {e}")
+import logging
+import os
+from .services import resources
+from .upload_handlers import size_limit_message
+
+logger = logging.getLogger(__name__)
+
+# pandas, joblib/xgboost, les modèles et les CSV de référence ne sont chargés qu'au premier
+# besoin via services.resources (ou à l'avance par le préchargement optionnel de apps.py).
 
 # --- Features attendues ---
 EXPECTED_FEATURES = [
@@ -42,26 +23,38 @@ EXPECTED_FEATURES = [
 ]
 
 def predict_view(request):
+    import pandas as pd
+    from .services.data_processing import preprocess_data
+    from .services.upload_handling import read_uploaded_csv
+
+    events_holidays_df = resources.get_events_holidays()
     context = {}
     if request.method == 'POST' and request.FILES.get('csv_file'):
         uploaded_file = request.FILES['csv_file']
-        fs = FileSystemStorage(location=MEDIA_ROOT_DIR)
-        filename = fs.save(uploaded_file.name, uploaded_file)
-        file_path = fs.path(filename)
 
         try:
-            df_uploaded = pd.read_csv(file_path)
-            df_processed = preprocess_data(df_uploaded.copy(), EVENTS_HOLIDAYS_DF.copy())
+            # Lecture directe du flux uploadé (gzip/zstd décompressés à la volée), sans passer par media/
+            df_uploaded = read_uploaded_csv(uploaded_file)
+            df_processed = preprocess_data(df_uploaded.copy(), events_holidays_df.copy(),
+                                           lag_store=resources.get_lag_store())
             df_processed['Date'] = pd.to_datetime(df_processed['Date'])
 
             model_name = request.POST.get('model_choice', 'XGBoost')
-            model = MODELS.get(model_name)
+            models, model_versions = resources.get_models()
+            model = models.get(model_name)
             if not model:
                 messages.error(request, f"Le modèle {model_name} n'est pas disponible.")
             else:
                 df_features_for_prediction = df_processed[EXPECTED_FEATURES]
                 predictions = model.predict(df_features_for_prediction)
                 df_processed['Predictions'] = predictions.tolist()
+
+                audit_seconds = resources.get_audit_writer().submit(model_name, model_versions.get(model_name),
+                                                                    df_uploaded, df_processed)
+                logger.info("Journal d'audit : %.2f ms sur la requête (%d lignes)",
+                             audit_seconds * 1000, len(df_processed))
+                resources.get_monitor().update(model_name, df_processed, uploaded_columns=df_uploaded.columns)
+
                 df_processed['Date'] = df_processed['Date'].dt.strftime('%Y-%m-%d')
 
                 chart_data = df_processed[['Date', 'Passagers_Reels', 'Predictions']].to_dict(orient='records')
@@ -76,14 +69,15 @@ def predict_view(request):
             messages.error(request, f"Erreur de données : {e}")
         except Exception as e:
             messages.error(request, f"Une erreur est survenue : {e}")
-        finally:
-            if os.path.exists(file_path):
-                fs.delete(filename)
+    elif getattr(request, 'upload_too_large', False):
+        # Upload interrompu pendant la réception par BoundedMemoryFileUploadHandler
+        messages.error(request, f"Erreur de données : {size_limit_message()}")
 
     # --- Charger les données historiques ---
     try:
-        df_history_raw = pd.read_csv(RAW_DATA_PATH)
-        df_history_processed = preprocess_data(df_history_raw.copy(), EVENTS_HOLIDAYS_DF.copy())
+        df_history_raw = pd.read_csv(resources.RAW_DATA_PATH)
+        df_history_processed = preprocess_data(df_history_raw.copy(), events_holidays_df.copy(),
+                                               lag_features=False)
         if 'Nb_Passagers' in df_history_processed.columns:
             df_history_processed.rename(columns={'Nb_Passagers':'Passagers_Reels'}, inplace=True)
         df_history_processed['Date'] = pd.to_datetime(df_history_processed['Date']).dt.strftime('%Y-%m-%d')
@@ -92,3 +86,18 @@ def predict_view(request):
         print(f"Erreur chargement historique : {e}")
 
     return render(request, 'prediction_app/prediction_form.html', context)
+
+
+@staff_member_required
+def monitoring_view(request):
+    """
+    Tableau de bord JSON : erreurs par modèle, dérive (PSI/KS) des features et coût du journal d'audit.
+    Réservé au personnel (statistiques d'audit). Les agrégats sont tenus en mémoire par processus :
+    sous un serveur multi-processus, chaque réponse ne couvre que les requêtes servies par le
+    processus indiqué ('pid') depuis son démarrage, et tout redémarrage les remet à zéro.
+    """
+    snapshot = resources.get_monitor().snapshot()
+    snapshot['audit'] = resources.get_audit_writer().snapshot()
+    snapshot['scope'] = 'process'
+    snapshot['pid'] = os.getpid()
+    return JsonResponse(snapshot)